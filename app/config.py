@@ -1,4 +1,5 @@
 from typing import List, Set
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 
@@ -29,10 +30,36 @@ class Settings(BaseSettings):
     max_file_size: int
     allowed_extensions: Set[str]
     allowed_file_extensions: Set[str]
+    max_batch_files: int = 30
 
     # Analysis
     mock_analysis: bool
 
+    # Quality gate
+    quality_check_enabled: bool = True
+    quality_reject_low_quality: bool = False
+    quality_downscale_size: int = 512
+    quality_min_resolution: int = 224
+    quality_min_blur_score: float = 100.0
+    quality_max_clipped_ratio: float = 0.3
+
+    # Near-duplicate detection
+    duplicate_detection_enabled: bool = True
+    duplicate_hash_radius: int = 3
+
+    # Tiled region analysis
+    tiling_enabled: bool = False
+    tile_size: int = Field(default=512, gt=0)
+    tile_overlap: int = Field(default=64, ge=0)
+    tiling_workers: int = Field(default=0, ge=0)
+
+    # Tracing
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 0.05
+    tracing_export_path: Path = Path("traces/spans.jsonl")
+    tracing_batch_size: int = 512
+    tracing_flush_interval: float = 5.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -40,6 +67,15 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
+    @model_validator(mode="after")
+    def check_tile_overlap(self) -> "Settings":
+        """Overlap must leave a positive stride between neighbouring tiles"""
+        if self.tile_overlap >= self.tile_size:
+            raise ValueError(
+                f"tile_overlap ({self.tile_overlap}) must be smaller than tile_size ({self.tile_size})"
+            )
+        return self
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Ensure upload directory exists
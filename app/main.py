@@ -1,11 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 from app.routes import upload, analyze
 from app.config import settings
 from app.middleware.logging import LoggingMiddleware
 from app.middleware.authentication import APIKeyMiddleware
+from app.middleware.tracing import TracingMiddleware
 from app.utils.logger import setup_logging, get_logger
+from app.utils.tracing import span_exporter
+from app.services.tiling_service import shutdown_tile_pool, warm_tile_pool
+from app.services.duplicate_service import duplicate_service
 from app.models.responses import HealthCheckResponse
 
 
@@ -17,9 +22,17 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Log level: {settings.log_level}")
+    if settings.duplicate_detection_enabled:
+        # Load the near-duplicate index before serving so no request waits on it
+        await run_in_threadpool(duplicate_service.load)
+    if settings.tiling_enabled:
+        # Spawn tile workers now rather than on the first high-resolution request
+        await run_in_threadpool(warm_tile_pool)
     yield
     # Shutdown
     logger.info("Shutting down application")
+    shutdown_tile_pool()
+    span_exporter.shutdown()
 
 
 setup_logging(settings.log_level)
@@ -80,6 +93,9 @@ app.openapi = custom_openapi
 
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(APIKeyMiddleware)
+# Added after authentication so the root span also covers the API key check
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
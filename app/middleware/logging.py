@@ -5,6 +5,7 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.utils.logger import correlation_id, get_logger
+from app.utils.tracing import set_span_attribute
 
 logger = get_logger(__name__)
 
@@ -16,6 +17,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         # Generate correlation ID
         corr_id = str(uuid.uuid4())
         correlation_id.set(corr_id)
+        set_span_attribute('correlation_id', corr_id)
 
         # Add to response headers
         start_time = time.time()
@@ -0,0 +1,33 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.tracing import should_sample, start_trace
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that opens a root span for sampled requests.
+
+    Implemented as plain ASGI rather than BaseHTTPMiddleware so unsampled
+    requests are passed straight through without an extra task or body wrapper.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Sampling is decided up front so unsampled requests skip all span bookkeeping
+        if scope["type"] != "http" or not should_sample():
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        with start_trace(f"{method} {path}", **{'http.method': method, 'http.route': path}) as root:
+
+            async def send_with_trace(message: Message):
+                if message["type"] == "http.response.start":
+                    root.set_attribute('http.status_code', message["status"])
+                    MutableHeaders(scope=message).append('X-Trace-ID', root.trace_id)
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
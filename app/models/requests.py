@@ -9,10 +9,15 @@ class AnalysisRequest(BaseModel):
         example="abc123-def456-ghi789",
         min_length=1
     )
+    reuse_duplicates: bool = Field(
+        default=False,
+        description="Return the stored analysis of a near-duplicate image from the same client, if one exists"
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
-                "image_id": "abc123-def456-ghi789"
+                "image_id": "abc123-def456-ghi789",
+                "reuse_duplicates": False
             }
         }
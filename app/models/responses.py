@@ -24,6 +24,16 @@ class UploadResponse(BaseResponse):
     file_size: int = Field(..., description="File size in bytes", example=102400)
 
 
+class QualityMetrics(BaseModel):
+    """Image quality scores computed before analysis"""
+    passed: bool = Field(..., description="Indicates if the image passed all quality checks")
+    blur_score: float = Field(..., description="Laplacian variance; higher is sharper", example=412.7)
+    underexposed_ratio: float = Field(..., ge=0.0, le=1.0, description="Fraction of clipped shadow pixels", example=0.01)
+    overexposed_ratio: float = Field(..., ge=0.0, le=1.0, description="Fraction of clipped highlight pixels", example=0.02)
+    mean_brightness: float = Field(..., description="Mean grayscale brightness (0-255)", example=128.4)
+    issues: List[str] = Field(default_factory=list, description="Reasons the image failed quality checks")
+
+
 class ImageMetadata(BaseModel):
     """Image metadata information"""
     format: str = Field(..., description="Image format", example="jpeg")
@@ -31,6 +41,7 @@ class ImageMetadata(BaseModel):
     height: int = Field(..., description="Image height in pixels", example=1080)
     file_size_kb: float = Field(..., description="File size in kilobytes", example=842.5)
     color_space: str = Field(..., description="Color space", example="RGB")
+    quality: Optional[QualityMetrics] = Field(None, description="Quality scores, when the quality check is enabled")
 
 
 class SkinTypeResult(BaseModel):
@@ -39,11 +50,20 @@ class SkinTypeResult(BaseModel):
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score (0-1)", example=0.92)
 
 
+class Region(BaseModel):
+    """Bounding box in image pixel coordinates"""
+    x: int = Field(..., ge=0, description="Left edge in pixels", example=640)
+    y: int = Field(..., ge=0, description="Top edge in pixels", example=320)
+    width: int = Field(..., ge=1, description="Width in pixels", example=256)
+    height: int = Field(..., ge=1, description="Height in pixels", example=192)
+
+
 class IssueResult(BaseModel):
     """Individual skin issue detection result"""
     name: str = Field(..., description="Issue name", example="Hyperpigmentation")
     severity: str = Field(..., description="Issue severity level", example="Medium")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score (0-1)", example=0.85)
+    region: Optional[Region] = Field(None, description="Image region of the issue, for region-level findings")
 
 
 class AnalysisResult(BaseModel):
@@ -61,6 +81,7 @@ class AnalysisResponse(BaseModel):
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat() + 'Z', description="Analysis timestamp")
     image_metadata: ImageMetadata = Field(..., description="Image metadata information")
     analysis: AnalysisResult = Field(..., description="Analysis results")
+    duplicate_of: Optional[str] = Field(None, description="Image whose analysis was reused, for near-duplicate images", example="zyx987-wvu654")
 
 
 class ErrorDetail(BaseModel):
@@ -90,3 +111,20 @@ class ErrorResponse(BaseModel):
                 "correlation_id": "abc123-def456"
             }
         }
+
+
+class BatchUploadItem(BaseModel):
+    """Per-file outcome of a batch upload"""
+    index: int = Field(..., description="Position of the file in the multipart request", example=0)
+    filename: str = Field(..., description="Original filename", example="image.jpg")
+    success: bool = Field(..., description="Indicates if this file was stored")
+    upload: Optional[UploadResponse] = Field(None, description="Upload result when the file was stored")
+    error: Optional[ErrorDetail] = Field(None, description="Error details when the file was rejected")
+
+
+class BatchUploadResponse(BaseResponse):
+    """Batch image upload response; `success` is true only when every file was stored"""
+    total: int = Field(..., description="Number of files received", example=3)
+    succeeded: int = Field(..., description="Number of files stored", example=2)
+    failed: int = Field(..., description="Number of files rejected", example=1)
+    results: List[BatchUploadItem] = Field(..., description="Per-file results in request order")
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
 from app.services.image_service import ImageService
 from app.services.analysis_service import AnalysisService
+from app.services.quality_service import ImageQualityError
+from app.services.duplicate_service import duplicate_service
 from app.models.requests import AnalysisRequest
 from app.models.responses import AnalysisResponse
 from app.utils.logger import get_logger
+from app.utils.tracing import span
 
 router = APIRouter()
 image_service = ImageService()
@@ -12,7 +18,10 @@ logger = get_logger(__name__)
 
 
 @router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_image(request: AnalysisRequest):
+async def analyze_image(
+    request: AnalysisRequest,
+    x_client_id: Optional[str] = Header(None, description="Optional client identifier used to scope near-duplicate detection")
+):
     try:
         logger.info(f"Processing analysis request for image_id: {request.image_id}")
 
@@ -28,12 +37,47 @@ async def analyze_image(request: AnalysisRequest):
 
         logger.info(f"Found image at path: {image_path}")
 
+        # Metadata and the quality gate always describe the requested image
+        image_metadata = await run_in_threadpool(analysis_service.inspect_image, image_path)
+
+        # Reuse the analysis of a near-duplicate image when requested
+        if request.reuse_duplicates and settings.duplicate_detection_enabled:
+            with span("duplicate_lookup"):
+                cached = await run_in_threadpool(
+                    duplicate_service.find_cached_analysis, request.image_id, image_path, x_client_id
+                )
+            if cached:
+                duplicate_of, analysis = cached
+                logger.info(f"Returning cached analysis of {duplicate_of} for image_id: {request.image_id}")
+                with span("build_response"):
+                    return AnalysisResponse(
+                        image_id=request.image_id,
+                        image_metadata=image_metadata,
+                        analysis=analysis,
+                        duplicate_of=duplicate_of
+                    )
+
         # Perform analysis
-        results = analysis_service.analyze_image(request.image_id, image_path)
+        results = await run_in_threadpool(
+            analysis_service.analyze_image, request.image_id, image_path, image_metadata
+        )
         logger.info(f"Analysis completed for image_id: {request.image_id}")
 
-        return AnalysisResponse(**results)
+        if settings.duplicate_detection_enabled:
+            try:
+                with span("result_store"):
+                    await run_in_threadpool(
+                        duplicate_service.store_analysis, request.image_id, image_path, results["analysis"], x_client_id
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to store analysis result for reuse: {str(e)}")
+
+        with span("build_response"):
+            return AnalysisResponse(**results)
 
+    except ImageQualityError as e:
+        logger.warning(f"Image {request.image_id} rejected by quality check: {e.quality['issues']}")
+        raise HTTPException(status_code=422, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
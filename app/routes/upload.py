@@ -1,21 +1,44 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from app.utils.validators import validate_image_upload
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+from fastapi import APIRouter, File, Header, UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.utils.validators import validate_image_upload, validate_image_bytes, precheck_image_upload
 from app.services.image_service import ImageService
-from app.models.responses import UploadResponse
+from app.services.duplicate_service import duplicate_service
+from app.models.responses import UploadResponse, BatchUploadItem, BatchUploadResponse, ErrorDetail
 from app.utils.logger import get_logger
+from app.utils.tracing import span
 
 router = APIRouter()
 image_service = ImageService()
 logger = get_logger(__name__)
 
+CLIENT_ID_HEADER = Header(None, description="Optional client identifier used to scope near-duplicate detection")
+
+
+async def _register_perceptual_hash(image_id: str, file_path: str, client_id: Optional[str]) -> None:
+    """Index the stored image for near-duplicate lookups without failing the upload"""
+    if not settings.duplicate_detection_enabled:
+        return
+    try:
+        await run_in_threadpool(duplicate_service.register, image_id, Path(file_path), client_id)
+    except Exception as e:
+        logger.warning(f"Failed to compute perceptual hash for {image_id}: {str(e)}")
+
 
 @router.post("/upload", response_model=UploadResponse, status_code=201)
-async def upload_image(file: UploadFile = File(..., description="Image file (JPEG or PNG, max 5MB)")):
+async def upload_image(
+    file: UploadFile = File(..., description="Image file (JPEG or PNG, max 5MB)"),
+    x_client_id: Optional[str] = CLIENT_ID_HEADER
+):
     try:
         logger.info(f"Processing upload request for file: {file.filename}")
 
         # Validate the uploaded file
-        await validate_image_upload(file)
+        with span("validation", filename=file.filename or "unknown"):
+            await validate_image_upload(file)
 
         # Get file size for response
         contents = await file.read()
@@ -30,11 +53,14 @@ async def upload_image(file: UploadFile = File(..., description="Image file (JPE
         file_path = await image_service.save_image(file, image_id)
         logger.info(f"Image saved successfully: {file_path}")
 
-        return UploadResponse(
-            image_id=image_id,
-            filename=file.filename or "unknown",
-            file_size=file_size
-        )
+        await _register_perceptual_hash(image_id, file_path, x_client_id)
+
+        with span("build_response"):
+            return UploadResponse(
+                image_id=image_id,
+                filename=file.filename or "unknown",
+                file_size=file_size
+            )
 
     except HTTPException:
         logger.warning(f"Upload validation failed for file: {file.filename}")
@@ -42,3 +68,79 @@ async def upload_image(file: UploadFile = File(..., description="Image file (JPE
     except Exception as e:
         logger.error(f"Failed to process image upload: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to process image upload: {str(e)}")
+
+
+async def _process_batch_file(index: int, file: UploadFile, client_id: Optional[str]) -> BatchUploadItem:
+    """Validate and store a single file from a batch, capturing failures per file"""
+    filename = file.filename or "unknown"
+    try:
+        with span("validation", filename=filename, index=index):
+            # Reject on the declared type and size so bad parts are never read into memory
+            precheck_image_upload(file)
+            contents = await file.read()
+            validate_image_bytes(file.content_type, contents)
+
+        image_id = image_service.generate_image_id()
+        file_path = await image_service.save_image_bytes(contents, file.filename, image_id)
+        logger.info(f"Batch image {index} saved successfully: {file_path}")
+
+        await _register_perceptual_hash(image_id, file_path, client_id)
+
+        return BatchUploadItem(
+            index=index,
+            filename=filename,
+            success=True,
+            upload=UploadResponse(
+                image_id=image_id,
+                filename=filename,
+                file_size=len(contents)
+            )
+        )
+
+    except HTTPException as e:
+        logger.warning(f"Batch upload validation failed for file {index}: {filename}")
+        return BatchUploadItem(
+            index=index,
+            filename=filename,
+            success=False,
+            error=ErrorDetail(code="VALIDATION_ERROR", message=str(e.detail), field="files")
+        )
+    except Exception as e:
+        logger.error(f"Failed to store batch file {index}: {str(e)}", exc_info=True)
+        return BatchUploadItem(
+            index=index,
+            filename=filename,
+            success=False,
+            error=ErrorDetail(code="STORAGE_ERROR", message=f"Failed to store image: {str(e)}", field="files")
+        )
+
+
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_images_batch(
+    files: List[UploadFile] = File(..., description="Image files (JPEG or PNG, max 5MB each)"),
+    x_client_id: Optional[str] = CLIENT_ID_HEADER
+):
+    logger.info(f"Processing batch upload request with {len(files)} file(s)")
+
+    if len(files) > settings.max_batch_files:
+        logger.warning(f"Batch upload rejected: {len(files)} files exceeds limit of {settings.max_batch_files}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum per batch: {settings.max_batch_files}. Got: {len(files)}"
+        )
+
+    # Each file is validated and persisted concurrently; failures are reported per file
+    results = await asyncio.gather(
+        *(_process_batch_file(index, file, x_client_id) for index, file in enumerate(files))
+    )
+    succeeded = sum(1 for item in results if item.success)
+    logger.info(f"Batch upload completed: {succeeded}/{len(results)} file(s) stored")
+
+    with span("build_response"):
+        return BatchUploadResponse(
+            success=succeeded == len(results),
+            total=len(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            results=list(results)
+        )
@@ -1,8 +1,12 @@
 import random
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 from pathlib import Path
 from PIL import Image
+from app.config import settings
+from app.services.quality_service import QualityService, ImageQualityError
+from app.services.tiling_service import TilingService
+from app.utils.tracing import span
 
 
 class AnalysisService:
@@ -37,38 +41,64 @@ class AnalysisService:
             }
 
     @staticmethod
-    def analyze_image(image_id: str, image_path: Path) -> Dict:
-        # Generate deterministic results based on image_id for consistency
-        random.seed(image_id)
+    def inspect_image(image_path: Path) -> Dict:
+        """
+        Extract metadata and run the quality gate for an image.
 
+        Raises:
+            ImageQualityError: If the image fails the quality gate and rejection is enabled
+        """
         # Extract image metadata
-        image_metadata = AnalysisService.extract_image_metadata(image_path)
-
-        # Select random skin type
-        skin_type = random.choice(AnalysisService.SKIN_TYPES)
-        skin_type_confidence = round(random.uniform(0.85, 0.98), 2)
-
-        # Select 1-3 random issues with severity
-        num_issues = random.randint(1, 3)
-        selected_issues = random.sample(AnalysisService.ISSUES, num_issues)
-
-        issues = []
-        for issue_name in selected_issues:
-            issues.append({
-                "name": issue_name,
-                "severity": random.choice(AnalysisService.SEVERITIES),
-                "confidence": round(random.uniform(0.75, 0.95), 2)
-            })
-
-        # Calculate overall confidence (average of skin_type and issues)
-        issue_confidences = [issue["confidence"] for issue in issues]
-        overall_confidence = round(
-            (skin_type_confidence + sum(issue_confidences)) / (len(issue_confidences) + 1),
-            2
-        )
-
-        # Reset random seed
-        random.seed()
+        with span("metadata_extraction"):
+            image_metadata = AnalysisService.extract_image_metadata(image_path)
+
+        # Run the quality gate before the expensive analysis
+        if settings.quality_check_enabled:
+            with span("quality_check"):
+                quality = QualityService.assess(image_path, image_metadata["width"], image_metadata["height"])
+            image_metadata["quality"] = quality
+            if not quality["passed"] and settings.quality_reject_low_quality:
+                raise ImageQualityError(quality)
+
+        return image_metadata
+
+    @staticmethod
+    def analyze_image(image_id: str, image_path: Path, image_metadata: Optional[Dict] = None) -> Dict:
+        # Callers that already inspected the image pass its metadata to skip a second pass
+        if image_metadata is None:
+            image_metadata = AnalysisService.inspect_image(image_path)
+
+        with span("analysis"):
+            # Generate deterministic results based on image_id for consistency; a local
+            # generator keeps concurrent analyses in worker threads independent
+            rng = random.Random(image_id)
+
+            # Select random skin type
+            skin_type = rng.choice(AnalysisService.SKIN_TYPES)
+            skin_type_confidence = round(rng.uniform(0.85, 0.98), 2)
+
+            # Select 1-3 random issues with severity
+            num_issues = rng.randint(1, 3)
+            selected_issues = rng.sample(AnalysisService.ISSUES, num_issues)
+
+            issues = []
+            for issue_name in selected_issues:
+                issues.append({
+                    "name": issue_name,
+                    "severity": rng.choice(AnalysisService.SEVERITIES),
+                    "confidence": round(rng.uniform(0.75, 0.95), 2)
+                })
+
+            # Calculate overall confidence (average of skin_type and issues)
+            issue_confidences = [issue["confidence"] for issue in issues]
+            overall_confidence = round(
+                (skin_type_confidence + sum(issue_confidences)) / (len(issue_confidences) + 1),
+                2
+            )
+
+        # Add region-level findings from the tiled pipeline
+        if settings.tiling_enabled:
+            issues.extend(TilingService.analyze_regions(image_path))
 
         return {
             "image_id": image_id,
@@ -80,6 +110,6 @@ class AnalysisService:
                 },
                 "issues": issues,
                 "confidence": overall_confidence,
-                "analysis_notes": f"Detected {skin_type.lower()} skin with {num_issues} issue(s)."
+                "analysis_notes": f"Detected {skin_type.lower()} skin with {len(issues)} issue(s)."
             }
         }
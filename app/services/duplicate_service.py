@@ -0,0 +1,237 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+from app.config import settings
+from app.services.image_service import ImageService
+from app.utils.logger import get_logger
+from app.utils.tracing import span
+
+logger = get_logger(__name__)
+
+HASH_BITS = 64
+DEFAULT_CLIENT_ID = "default"
+
+
+def dhash(image_path: Path) -> int:
+    """Compute a 64-bit difference hash (dHash) of an image"""
+    with Image.open(image_path) as img:
+        # Only a 9x8 thumbnail is needed, so let JPEG decode at the smallest scale
+        img.draft("L", (9, 8))
+        small = img.convert("L").resize((9, 8), Image.Resampling.BOX)
+        pixels = np.asarray(small, dtype=np.int16)
+
+    # One bit per horizontally adjacent pixel pair: is the right pixel brighter?
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+class MultiIndexHashTable:
+    """
+    Hamming-radius index over 64-bit hashes using multi-index hashing.
+
+    Each hash is split into radius + 1 disjoint chunks, each indexed in its own
+    exact-match table. By the pigeonhole principle any hash within the radius
+    matches the query exactly on at least one chunk, so a query only verifies
+    the few candidates sharing a bucket instead of scanning every hash.
+    """
+
+    def __init__(self, radius: int):
+        self.radius = radius
+        num_chunks = radius + 1
+        base, extra = divmod(HASH_BITS, num_chunks)
+
+        self._chunks: List[Tuple[int, int]] = []
+        shift = 0
+        for i in range(num_chunks):
+            width = base + (1 if i < extra else 0)
+            self._chunks.append((shift, (1 << width) - 1))
+            shift += width
+
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in self._chunks]
+        self._hashes: List[int] = []
+        self._keys: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, key: str, value: int) -> None:
+        """Index a hash under the given key"""
+        entry = len(self._hashes)
+        self._hashes.append(value)
+        self._keys.append(key)
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            table.setdefault((value >> shift) & mask, []).append(entry)
+
+    def query(self, value: int) -> List[Tuple[str, int]]:
+        """Return (key, distance) pairs within the radius, closest first"""
+        seen = set()
+        matches = []
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            for entry in table.get((value >> shift) & mask, ()):
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                distance = (self._hashes[entry] ^ value).bit_count()
+                if distance <= self.radius:
+                    matches.append((self._keys[entry], distance))
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+
+class DuplicateService:
+    """Near-duplicate detection and analysis result reuse, scoped per client"""
+
+    def __init__(self, index_path: Path, results_dir: Path, radius: int):
+        self.index_path = index_path
+        self.results_dir = results_dir
+        self.radius = radius
+
+        self._lock = threading.Lock()
+        self._tables: Dict[str, MultiIndexHashTable] = {}
+        # image_id -> (client_id, hash)
+        self._hashes: Dict[str, Tuple[str, int]] = {}
+
+    @staticmethod
+    def normalize_client_id(client_id: Optional[str]) -> str:
+        """Map an optional client header to a safe index key"""
+        if not client_id or not client_id.strip():
+            return DEFAULT_CLIENT_ID
+        return "_".join(client_id.split())
+
+    def load(self) -> None:
+        """
+        Rebuild the in-memory index from the append-only index file.
+
+        Called once at application startup, off the event loop. The index is
+        built without holding the lock and swapped in at the end, carrying over
+        any entries registered in the meantime. Unparsable lines and lines whose
+        image id could not have been generated by the service are skipped.
+        """
+        tables: Dict[str, MultiIndexHashTable] = {}
+        hashes: Dict[str, Tuple[str, int]] = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    try:
+                        client_id, image_id, hash_hex = line.rstrip("\n").split("\t")
+                        value = int(hash_hex, 16)
+                        if not ImageService.is_valid_image_id(image_id):
+                            raise ValueError(image_id)
+                    except ValueError:
+                        logger.warning(f"Skipping unparsable line {line_number} in {self.index_path}")
+                        continue
+                    self._add(tables, hashes, client_id, image_id, value)
+            logger.info(f"Loaded {len(hashes)} perceptual hash(es) from {self.index_path}")
+
+        with self._lock:
+            for image_id, (client_id, value) in self._hashes.items():
+                self._add(tables, hashes, client_id, image_id, value)
+            self._tables, self._hashes = tables, hashes
+
+    def _add(self, tables: Dict[str, MultiIndexHashTable], hashes: Dict[str, Tuple[str, int]],
+             client_id: str, image_id: str, value: int) -> None:
+        if image_id in hashes:
+            return
+        hashes[image_id] = (client_id, value)
+        table = tables.get(client_id)
+        if table is None:
+            table = tables[client_id] = MultiIndexHashTable(self.radius)
+        table.add(image_id, value)
+
+    def register(self, image_id: str, image_path: Path, client_id: Optional[str] = None) -> int:
+        """
+        Hash an image and add it to the client's index.
+
+        Args:
+            image_id: Unique identifier of the image
+            image_path: Path to the stored image
+            client_id: Optional client identifier used to scope duplicates
+
+        Returns:
+            The image's 64-bit perceptual hash
+
+        Raises:
+            ValueError: If the image id is not one generate_image_id could produce
+        """
+        # The id ends up in the index file and in result file names
+        if not ImageService.is_valid_image_id(image_id):
+            raise ValueError(f"Refusing to index invalid image id: {image_id!r}")
+
+        client_id = self.normalize_client_id(client_id)
+        with self._lock:
+            if image_id in self._hashes:
+                return self._hashes[image_id][1]
+
+        with span("perceptual_hash"):
+            value = dhash(image_path)
+
+        with self._lock:
+            if image_id not in self._hashes:
+                self._add(self._tables, self._hashes, client_id, image_id, value)
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.write(f"{client_id}\t{image_id}\t{value:016x}\n")
+        return value
+
+    def find_cached_analysis(self, image_id: str, image_path: Path,
+                             client_id: Optional[str] = None) -> Optional[Tuple[str, Dict]]:
+        """
+        Look up the stored analysis of the closest near-duplicate image.
+
+        Any failure (undecodable image, unreadable or partial result file) is
+        logged and treated as a cache miss so the caller runs a fresh analysis.
+
+        Returns:
+            Tuple of (duplicate image_id, analysis dict), or None on a miss
+        """
+        try:
+            value = self.register(image_id, image_path, client_id)
+            with self._lock:
+                table = self._tables.get(self.normalize_client_id(client_id))
+                matches = table.query(value) if table else []
+
+            for candidate_id, distance in matches:
+                if candidate_id == image_id:
+                    continue
+                result_path = self.results_dir / f"{candidate_id}.json"
+                if not result_path.exists():
+                    continue
+                with open(result_path, "r", encoding="utf-8") as f:
+                    analysis = json.load(f)
+                logger.info(f"Reusing analysis of {candidate_id} for {image_id} (distance {distance})")
+                return candidate_id, analysis
+        except Exception as e:
+            logger.warning(f"Near-duplicate lookup failed for {image_id}, treating as a miss: {str(e)}")
+        return None
+
+    def store_analysis(self, image_id: str, image_path: Path, analysis: Dict,
+                       client_id: Optional[str] = None) -> None:
+        """Persist an analysis result so near-duplicates can reuse it; invalid image ids are skipped"""
+        if not ImageService.is_valid_image_id(image_id):
+            logger.warning(f"Not storing analysis for invalid image id: {image_id!r}")
+            return
+
+        self.register(image_id, image_path, client_id)
+        self.results_dir.mkdir(exist_ok=True)
+
+        # Write to a temp file and rename so readers never see a partial result
+        fd, tmp_path = tempfile.mkstemp(dir=self.results_dir, prefix=f".{image_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(analysis, f)
+            os.replace(tmp_path, self.results_dir / f"{image_id}.json")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+# Shared instance so uploads and analyses see the same index
+duplicate_service = DuplicateService(
+    index_path=settings.upload_dir / "phash_index.tsv",
+    results_dir=settings.upload_dir / "analysis_results",
+    radius=settings.duplicate_hash_radius
+)
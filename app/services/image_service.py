@@ -1,8 +1,10 @@
 import uuid
 from pathlib import Path
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from app.config import settings
+from app.utils.tracing import span
 
 
 class ImageService:
@@ -12,17 +14,29 @@ class ImageService:
     def generate_image_id() -> str:
         return str(uuid.uuid4())
 
+    @staticmethod
+    def is_valid_image_id(image_id: str) -> bool:
+        """Check that an id has the canonical form produced by generate_image_id"""
+        try:
+            return str(uuid.UUID(image_id)) == image_id
+        except (ValueError, TypeError, AttributeError):
+            return False
+
     @staticmethod
     async def save_image(file: UploadFile, image_id: str) -> str:
+        contents = await file.read()
+        return await ImageService.save_image_bytes(contents, file.filename, image_id)
+
+    @staticmethod
+    async def save_image_bytes(contents: bytes, original_filename: Optional[str], image_id: str) -> str:
         # Get file extension
-        ext = Path(file.filename).suffix if file.filename else ".jpg"
+        ext = Path(original_filename).suffix if original_filename else ".jpg"
         filename = f"{image_id}{ext}"
         file_path = settings.upload_dir / filename
 
-        # Save file
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        # Write in a worker thread so concurrent saves don't block the event loop
+        with span("storage_write", bytes=len(contents)):
+            await run_in_threadpool(file_path.write_bytes, contents)
 
         return str(file_path)
 
@@ -0,0 +1,94 @@
+from typing import Dict, List
+from pathlib import Path
+import numpy as np
+from PIL import Image
+from app.config import settings
+
+
+class ImageQualityError(Exception):
+    """Raised when an image fails the pre-analysis quality gate"""
+
+    def __init__(self, quality: Dict):
+        self.quality = quality
+        super().__init__("Image failed quality check: " + "; ".join(quality["issues"]))
+
+
+class QualityService:
+    """Vectorized image quality checks run before analysis"""
+
+    # Histogram bins treated as clipped shadows / highlights
+    SHADOW_CLIP_LEVEL = 5
+    HIGHLIGHT_CLIP_LEVEL = 250
+
+    @staticmethod
+    def load_grayscale(image_path: Path, max_side: int) -> np.ndarray:
+        """Decode a downscaled grayscale copy of the image as a uint8 array"""
+        with Image.open(image_path) as img:
+            # JPEG can decode directly at 1/2, 1/4 or 1/8 scale, skipping most of the work
+            img.draft("L", (max_side, max_side))
+            gray = img.convert("L")
+            gray.thumbnail((max_side, max_side), Image.Resampling.BILINEAR)
+            return np.asarray(gray, dtype=np.uint8)
+
+    @staticmethod
+    def blur_score(gray: np.ndarray) -> float:
+        """Variance of the 4-neighbour Laplacian; low values indicate blur"""
+        if gray.shape[0] < 3 or gray.shape[1] < 3:
+            return 0.0
+        g = gray.astype(np.float32)
+        laplacian = (
+            g[:-2, 1:-1] + g[2:, 1:-1] + g[1:-1, :-2] + g[1:-1, 2:]
+            - 4.0 * g[1:-1, 1:-1]
+        )
+        return float(laplacian.var())
+
+    @staticmethod
+    def exposure_stats(gray: np.ndarray) -> Dict:
+        """Fraction of clipped shadow/highlight pixels and mean brightness"""
+        hist = np.bincount(gray.ravel(), minlength=256)
+        total = max(int(hist.sum()), 1)
+        levels = np.arange(256)
+        return {
+            "underexposed_ratio": float(hist[:QualityService.SHADOW_CLIP_LEVEL + 1].sum() / total),
+            "overexposed_ratio": float(hist[QualityService.HIGHLIGHT_CLIP_LEVEL:].sum() / total),
+            "mean_brightness": float((hist * levels).sum() / total),
+        }
+
+    @staticmethod
+    def assess(image_path: Path, width: int, height: int) -> Dict:
+        """
+        Score blur, exposure and resolution for an image.
+
+        Args:
+            image_path: Path to the stored image
+            width: Original image width in pixels
+            height: Original image height in pixels
+
+        Returns:
+            Dict of quality scores with a `passed` flag and a list of failure reasons
+        """
+        gray = QualityService.load_grayscale(image_path, settings.quality_downscale_size)
+        blur_score = QualityService.blur_score(gray)
+        exposure = QualityService.exposure_stats(gray)
+
+        issues: List[str] = []
+        if min(width, height) < settings.quality_min_resolution:
+            issues.append(
+                f"Resolution too low: {width}x{height}, "
+                f"shortest side must be at least {settings.quality_min_resolution}px"
+            )
+        if blur_score < settings.quality_min_blur_score:
+            issues.append(f"Image is too blurry (score {blur_score:.1f})")
+        if exposure["underexposed_ratio"] > settings.quality_max_clipped_ratio:
+            issues.append(f"Image is underexposed ({exposure['underexposed_ratio']:.0%} of pixels clipped)")
+        if exposure["overexposed_ratio"] > settings.quality_max_clipped_ratio:
+            issues.append(f"Image is overexposed ({exposure['overexposed_ratio']:.0%} of pixels clipped)")
+
+        return {
+            "passed": not issues,
+            "blur_score": round(blur_score, 2),
+            "underexposed_ratio": round(exposure["underexposed_ratio"], 4),
+            "overexposed_ratio": round(exposure["overexposed_ratio"], 4),
+            "mean_brightness": round(exposure["mean_brightness"], 2),
+            "issues": issues,
+        }
@@ -0,0 +1,98 @@
+"""
+Per-tile region analysis run inside pool worker processes.
+
+This module only depends on NumPy so spawned workers start quickly and never
+load application settings. Pixel data is read from a shared-memory buffer
+created by the parent process, so tiles are analysed without being copied.
+"""
+import os
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# (x, y, width, height) in full-image pixel coordinates
+Box = Tuple[int, int, int, int]
+
+# A pixel counts as red when R exceeds G by this much (0-255 scale)
+REDNESS_MARGIN = 40
+# A pixel counts as a dark spot when darker than this fraction of the image's median luminance
+DARK_SPOT_RATIO = 0.6
+# Minimum fraction of flagged pixels before a tile reports a finding
+MIN_COVERAGE = 0.05
+
+
+def _severity(coverage: float) -> str:
+    if coverage < 0.25:
+        return "Low"
+    if coverage < 0.5:
+        return "Medium"
+    return "High"
+
+
+def _finding(name: str, mask: np.ndarray, box: Box) -> List[Dict]:
+    """Turn a boolean pixel mask into a finding bounded to its flagged pixels"""
+    coverage = float(mask.mean())
+    if coverage < MIN_COVERAGE:
+        return []
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    x, y, _, _ = box
+    return [{
+        "name": name,
+        "severity": _severity(coverage),
+        "confidence": round(min(0.95, 0.5 + coverage), 2),
+        "region": {
+            "x": x + int(cols[0]),
+            "y": y + int(rows[0]),
+            "width": int(cols[-1] - cols[0] + 1),
+            "height": int(rows[-1] - rows[0] + 1),
+        },
+    }]
+
+
+def analyze_tile(pixels: np.ndarray, box: Box, dark_threshold: float) -> List[Dict]:
+    """
+    Detect region-level issues in one tile of an RGB image.
+
+    `pixels` is an RGB or RGBX array; only the first three channels are read.
+    Placeholder colour heuristics standing in for a region model: they exercise
+    the tiling pipeline end to end and are replaced by real inference later.
+    `dark_threshold` is computed once over the whole image so that results do
+    not depend on where tile edges fall.
+    """
+    x, y, width, height = box
+    tile = pixels[y:y + height, x:x + width, :3].astype(np.int32)
+    red, green, blue = tile[..., 0], tile[..., 1], tile[..., 2]
+
+    luminance = (red * 77 + green * 150 + blue * 29) >> 8
+
+    return (
+        _finding("Redness", (red - green) > REDNESS_MARGIN, box)
+        + _finding("Hyperpigmentation", luminance < dark_threshold, box)
+    )
+
+
+def warm_up() -> int:
+    """No-op task used to start a worker and import this module ahead of traffic"""
+    return os.getpid()
+
+
+def analyze_shared_tiles(shm_name: str, shape: Tuple[int, ...], boxes: List[Box],
+                         dark_threshold: float) -> List[Dict]:
+    """Pool entry point: attach to the shared image buffer and analyse a group of tiles"""
+    # Pool workers share the parent's resource tracker, which unlinks the segment
+    # once when the parent does; attaching here only closes the local mapping
+    shm = shared_memory.SharedMemory(name=shm_name)
+    pixels = None
+    try:
+        pixels = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        findings: List[Dict] = []
+        for box in boxes:
+            findings.extend(analyze_tile(pixels, box, dark_threshold))
+        return findings
+    finally:
+        # The view must be released before the mapping can be closed
+        pixels = None
+        shm.close()
@@ -0,0 +1,230 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from PIL import Image, ImageStat
+from app.config import settings
+from app.services.tile_worker import DARK_SPOT_RATIO, Box, analyze_shared_tiles, analyze_tile, warm_up
+from app.utils.logger import get_logger
+from app.utils.tracing import span
+
+logger = get_logger(__name__)
+
+SEVERITY_ORDER = {"Low": 0, "Medium": 1, "High": 2}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tile_pool() -> ProcessPoolExecutor:
+    """Return the shared tile worker pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned workers avoid forking the server's threads and event loop
+            _executor = ProcessPoolExecutor(
+                max_workers=TilingService.worker_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def warm_tile_pool() -> None:
+    """Start every pool worker up front so the first tiled request does not pay for spawning"""
+    workers = TilingService.worker_count()
+    if workers <= 1:
+        return
+    pool = get_tile_pool()
+    pids = {future.result() for future in [pool.submit(warm_up) for _ in range(workers)]}
+    logger.info(f"Tile worker pool ready with {len(pids)} process(es)")
+
+
+def _discard_tile_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call creates a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_tile_pool() -> None:
+    """Stop the tile worker pool, if it was started"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+class TilingService:
+    """Splits high-resolution images into overlapping tiles analysed in parallel"""
+
+    @staticmethod
+    def worker_count() -> int:
+        if settings.tiling_workers:
+            return settings.tiling_workers
+        # CPUs this process may run on, not every CPU on the host
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0)) or 1
+        return os.cpu_count() or 1
+
+    @staticmethod
+    def tile_boxes(width: int, height: int, tile_size: int, overlap: int) -> List[Box]:
+        """
+        Cover an image with overlapping tiles.
+
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+            tile_size: Tile edge length in pixels
+            overlap: Pixels shared by neighbouring tiles
+
+        Returns:
+            List of (x, y, width, height) boxes; edge tiles are aligned to the border
+
+        Raises:
+            ValueError: If the tile size or overlap leaves no positive stride
+        """
+        if tile_size <= 0 or not 0 <= overlap < tile_size:
+            raise ValueError(f"Invalid tiling: tile_size={tile_size}, overlap={overlap}")
+        stride = tile_size - overlap
+
+        def starts(length: int) -> List[int]:
+            if length <= tile_size:
+                return [0]
+            positions = list(range(0, length - tile_size + 1, stride))
+            if positions[-1] != length - tile_size:
+                positions.append(length - tile_size)
+            return positions
+
+        return [
+            (x, y, min(tile_size, width - x), min(tile_size, height - y))
+            for y in starts(height)
+            for x in starts(width)
+        ]
+
+    @staticmethod
+    def merge_findings(findings: List[Dict]) -> List[Dict]:
+        """Combine same-issue findings whose regions touch across tile overlaps"""
+        merged: List[Dict] = []
+        for finding in findings:
+            current = {**finding, "region": dict(finding["region"])}
+            absorbed = True
+            # Keep absorbing until the grown region no longer touches any earlier finding
+            while absorbed:
+                absorbed = False
+                for other in merged:
+                    if other["name"] == current["name"] and TilingService._touches(other["region"], current["region"]):
+                        merged.remove(other)
+                        current = TilingService._combine(other, current)
+                        absorbed = True
+                        break
+            merged.append(current)
+        return merged
+
+    @staticmethod
+    def _touches(a: Dict, b: Dict) -> bool:
+        return (
+            a["x"] <= b["x"] + b["width"] and b["x"] <= a["x"] + a["width"]
+            and a["y"] <= b["y"] + b["height"] and b["y"] <= a["y"] + a["height"]
+        )
+
+    @staticmethod
+    def _combine(a: Dict, b: Dict) -> Dict:
+        x = min(a["region"]["x"], b["region"]["x"])
+        y = min(a["region"]["y"], b["region"]["y"])
+        right = max(a["region"]["x"] + a["region"]["width"], b["region"]["x"] + b["region"]["width"])
+        bottom = max(a["region"]["y"] + a["region"]["height"], b["region"]["y"] + b["region"]["height"])
+        return {
+            "name": a["name"],
+            "severity": max(a["severity"], b["severity"], key=SEVERITY_ORDER.__getitem__),
+            "confidence": max(a["confidence"], b["confidence"]),
+            "region": {"x": x, "y": y, "width": right - x, "height": bottom - y},
+        }
+
+    @staticmethod
+    def dark_threshold(image: Image.Image) -> float:
+        """Luminance below which a pixel counts as a dark spot, from the whole image's median"""
+        median = ImageStat.Stat(image.convert("L")).median[0]
+        return median * DARK_SPOT_RATIO
+
+    @staticmethod
+    def analyze_regions(image_path: Path) -> List[Dict]:
+        """
+        Run per-tile region analysis over an image.
+
+        The image is decoded once, as RGBX (Pillow's native layout for RGB). With
+        more than one worker the pixels are copied once into a shared-memory
+        buffer that pool workers map and read in place, so only tile coordinates
+        and findings cross process boundaries.
+
+        Returns:
+            Merged findings with `region` coordinates in full-image pixels
+        """
+        with Image.open(image_path) as img:
+            image = img.convert("RGBX")
+        width, height = image.size
+        boxes = TilingService.tile_boxes(width, height, settings.tile_size, settings.tile_overlap)
+        workers = min(TilingService.worker_count(), len(boxes))
+
+        with span("tiled_region_analysis", tiles=len(boxes), workers=workers):
+            dark_threshold = TilingService.dark_threshold(image)
+            # Not worth the IPC round trip for a single tile or a single worker
+            if workers <= 1:
+                pixels = np.asarray(image)
+                findings = [f for box in boxes for f in analyze_tile(pixels, box, dark_threshold)]
+            else:
+                findings = TilingService._analyze_in_pool(image, boxes, workers, dark_threshold)
+
+        merged = TilingService.merge_findings(findings)
+        logger.debug(f"Tiled analysis of {len(boxes)} tile(s) produced {len(merged)} region finding(s)")
+        return merged
+
+    @staticmethod
+    def _analyze_in_pool(image: Image.Image, boxes: List[Box], workers: int, dark_threshold: float) -> List[Dict]:
+        """Copy the decoded pixels into shared memory and fan tile groups out to the pool"""
+        width, height = image.size
+        shape = (height, width, 4)
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        shared = target = None
+        try:
+            # Pillow maps RGBX buffers in place, so pasting into the mapped image
+            # copies the decoded rows straight into the segment with no temporary.
+            # Mapped images are flagged read-only; clear it so paste writes through.
+            target = Image.frombuffer("RGBX", image.size, shm.buf, "raw", "RGBX", 0, 1)
+            target.readonly = 0
+            target.paste(image)
+            shared = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+            # A couple of tile groups per worker balances load without per-tile IPC
+            group_size = math.ceil(len(boxes) / (workers * 2))
+            groups = [boxes[i:i + group_size] for i in range(0, len(boxes), group_size)]
+
+            # A worker that died (OOM kill, crash) breaks the whole pool: replace it
+            # and retry once, then fall back to analysing the tiles in this process
+            for attempt in range(2):
+                pool = get_tile_pool()
+                try:
+                    futures = [
+                        pool.submit(analyze_shared_tiles, shm.name, shape, group, dark_threshold)
+                        for group in groups
+                    ]
+                    return [f for future in futures for f in future.result()]
+                except BrokenProcessPool:
+                    logger.warning(f"Tile worker pool broke (attempt {attempt + 1}), replacing it")
+                    _discard_tile_pool(pool)
+
+            logger.warning("Tile worker pool unavailable, analysing tiles inline")
+            return [f for box in boxes for f in analyze_tile(shared, box, dark_threshold)]
+        finally:
+            # The views must be released before the segment can be closed
+            shared = target = None
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,210 @@
+"""Lightweight request tracing with batched OTLP-compatible JSON export"""
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+# Active span for the current request; copied into thread-pool offloads with the context
+current_span: ContextVar[Optional["Span"]] = ContextVar('current_span', default=None)
+
+# Dedicated generator so sampling is unaffected by code that seeds the global `random`
+_sampler = random.Random()
+
+
+class Span:
+    """A single timed operation within a trace"""
+
+    __slots__ = (
+        'name', 'trace_id', 'span_id', 'parent_span_id', 'kind',
+        'start_ns', 'end_ns', 'attributes', 'error',
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: str = "",
+                 kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Serialize in the OTLP/JSON span encoding"""
+        status: Dict[str, Any] = {"code": STATUS_CODE_ERROR if self.error else STATUS_CODE_OK}
+        if self.error:
+            status["message"] = self.error
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": status,
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class SpanExporter:
+    """
+    Buffers finished spans in memory and appends them to a local file in batches.
+
+    Each flush writes one OTLP/JSON `ExportTraceServiceRequest` per line, the same
+    layout the OpenTelemetry collector file exporter produces, so the file can be
+    replayed into a collector or opened in a trace viewer.
+    """
+
+    def __init__(self, path: Path, batch_size: int, flush_interval: float, service_name: str):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.service_name = service_name
+
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._worker: Optional[threading.Thread] = None
+
+    def export(self, span: Span) -> None:
+        """Queue a finished span; the background worker writes it out"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._buffer.append(span)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._worker.start()
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered spans to the export file"""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if not spans:
+            return
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to export {len(spans)} span(s) to {self.path}: {str(e)}")
+
+    def shutdown(self) -> None:
+        """Stop the background worker and flush remaining spans"""
+        with self._lock:
+            self._stopped = True
+            worker = self._worker
+        self._wakeup.set()
+        if worker is not None:
+            worker.join()
+        self.flush()
+
+
+span_exporter = SpanExporter(
+    path=settings.tracing_export_path,
+    batch_size=settings.tracing_batch_size,
+    flush_interval=settings.tracing_flush_interval,
+    service_name=settings.app_name
+)
+
+
+def should_sample() -> bool:
+    """Head-based sampling decision made once at the start of a request"""
+    return settings.tracing_enabled and _sampler.random() < settings.tracing_sample_rate
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        current_span.reset(token)
+        span_exporter.export(span)
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Span]:
+    """Start a new trace with a root span; nested `span()` calls attach to it"""
+    root = Span(name, trace_id=os.urandom(16).hex(), kind=SPAN_KIND_SERVER, attributes=attributes)
+    with _activate(root):
+        yield root
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a child of the current span.
+
+    Outside a sampled trace this is a no-op and yields None, so instrumentation
+    costs a single ContextVar lookup on unsampled requests.
+    """
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, parent.trace_id, parent.span_id, attributes=attributes)
+    with _activate(child):
+        yield child
+
+
+def set_span_attribute(key: str, value: Any) -> None:
+    """Attach an attribute to the current span, if the request is traced"""
+    active = current_span.get()
+    if active is not None:
+        active.set_attribute(key, value)
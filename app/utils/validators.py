@@ -17,21 +17,67 @@ async def validate_image_upload(file: UploadFile) -> Tuple[bool, str]:
     Raises:
         HTTPException: If validation fails
     """
-    # Check content type
-    if file.content_type not in settings.allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed types: JPEG, PNG. Got: {file.content_type}"
-        )
+    # Check content type before reading anything
+    _check_content_type(file.content_type)
 
     # Read file content to check size
     contents = await file.read()
-    file_size = len(contents)
 
     # Reset file pointer for later reading
     await file.seek(0)
 
-    # Check file size
+    return validate_image_bytes(file.content_type, contents)
+
+
+def precheck_image_upload(file: UploadFile) -> None:
+    """
+    Reject an upload from its declared content type and size, before it is read.
+
+    Args:
+        file: The uploaded file object; `size` is filled in by the multipart parser
+
+    Raises:
+        HTTPException: If the content type is not allowed or the file is too large
+    """
+    _check_content_type(file.content_type)
+    if file.size is not None:
+        _check_file_size(file.size)
+
+
+def validate_image_bytes(content_type: str, contents: bytes) -> Tuple[bool, str]:
+    """
+    Validate an image upload that has already been read into memory.
+
+    Args:
+        content_type: The declared content type of the upload
+        contents: The uploaded file bytes
+
+    Returns:
+        Tuple of (is_valid, error_message)
+
+    Raises:
+        HTTPException: If validation fails
+    """
+    _check_content_type(content_type)
+
+    file_size = len(contents)
+    _check_file_size(file_size)
+
+    if file_size == 0:
+        raise HTTPException(status_code=400, detail="Empty file uploaded")
+
+    return True, ""
+
+
+def _check_content_type(content_type: str) -> None:
+    if content_type not in settings.allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed types: JPEG, PNG. Got: {content_type}"
+        )
+
+
+def _check_file_size(file_size: int) -> None:
     if file_size > settings.max_file_size:
         max_mb = settings.max_file_size / 1024 / 1024
         actual_mb = file_size / 1024 / 1024
@@ -40,11 +86,6 @@ async def validate_image_upload(file: UploadFile) -> Tuple[bool, str]:
             detail=f"File too large. Maximum size: {max_mb:.0f}MB. Got: {actual_mb:.2f}MB"
         )
 
-    if file_size == 0:
-        raise HTTPException(status_code=400, detail="Empty file uploaded")
-
-    return True, ""
-
 
 def validate_file_extension(filename: str) -> bool:
     """Check if filename has a valid extension"""
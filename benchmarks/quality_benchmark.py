@@ -0,0 +1,55 @@
+"""Benchmark the pre-analysis quality gate.
+
+Run from the project root (settings are read from .env):
+
+    python -m benchmarks.quality_benchmark
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from app.config import settings
+from app.services.quality_service import QualityService
+
+# (label, width, height, format)
+CASES = [
+    ("1 MP JPEG", 1280, 800, "JPEG"),
+    ("12 MP JPEG", 4032, 3024, "JPEG"),
+    ("1 MP PNG", 1280, 800, "PNG"),
+]
+REPEAT = 20
+
+
+def make_image(path: Path, width: int, height: int, fmt: str) -> None:
+    """Write a synthetic photo-like image: a smooth gradient with sensor-style noise"""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    gradient = (x / width * 180 + y / height * 60)[..., None]
+    pixels = (gradient + rng.normal(0, 6, size=(height, width, 3))).clip(0, 255).astype(np.uint8)
+    Image.fromarray(pixels).save(path, fmt)
+
+
+def main() -> None:
+    print(f"downscale size: {settings.quality_downscale_size}px, {REPEAT} runs per case")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, width, height, fmt in CASES:
+            path = Path(tmp) / f"{width}x{height}.{fmt.lower()}"
+            make_image(path, width, height, fmt)
+
+            total = timeit.timeit(lambda: QualityService.assess(path, width, height), number=REPEAT)
+            gray = QualityService.load_grayscale(path, settings.quality_downscale_size)
+            scores = timeit.timeit(
+                lambda: (QualityService.blur_score(gray), QualityService.exposure_stats(gray)),
+                number=REPEAT
+            )
+            print(
+                f"{label:>11}: assess {total / REPEAT * 1000:7.2f} ms/image, "
+                f"scoring only {scores / REPEAT * 1000:5.2f} ms/image"
+            )
+
+
+if __name__ == "__main__":
+    main()